@@ -12,13 +12,17 @@
 #=============================================================================================#
 
 import subprocess
-import argparse
+import shlex
 import os
+import sys
 import re
 from datetime import datetime
+from functools import cache, lru_cache
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import zipfile
+import mmap
 import json
-import pymupdf
 
 #=============================================================================================#
 
@@ -27,6 +31,40 @@ APP_VERSION = "0.0.27"
 
 SAMPLE_PCB_FILE = "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
 
+# The KiCad command line program. It has to be in the PATH.
+KICAD_CLI = "kicad-cli"
+
+# Translation table for using the layer names in file names. Dots and spaces become underscores.
+LAYER_NAME_TRANS = str.maketrans (". ", "__")
+
+# Deflate level for the ZIP files, if the level in the configuration is not valid.
+# The Gerber, drill and CSV files are plain text and compress well.
+ZIP_COMPRESS_LEVEL = 6
+
+# Size of the write buffer for the ZIP files (1 MiB).
+ZIP_WRITE_BUFFER_SIZE = 1 << 20
+
+# Regular expression to extract the title block information from the PCB and schematic files.
+# All of the fields are matched by a single pattern, so the file is scanned only once.
+# The pattern works on bytes, so the file does not have to be decoded.
+PCB_INFO_PATTERN = re.compile (rb'\((title|date|rev|company|comment 1|comment 2) "([^"]+)"\)')
+
+# The dictionary keys for each of the fields matched by PCB_INFO_PATTERN.
+PCB_INFO_KEYS = {
+  b"title": "title",
+  b"date": "date",
+  b"rev": "rev",
+  b"company": "company",
+  b"comment 1": "comment1",
+  b"comment 2": "comment2",
+}
+
+# Number of bytes to search for the title block before searching the whole file (64 KiB).
+PCB_HEADER_SIZE = 1 << 16
+
+# The commands that can be used in the "commands" list of the configuration file.
+VALID_COMMANDS = frozenset (["gerbers", "drills", "sch_pdf", "bom", "ibom", "pcb_pdf", "positions", "ddd", "svg"])
+
 current_config = None
 default_config = None
 
@@ -40,6 +78,8 @@ DEFAULT_CONFIG_JSON = '''
   "commands": ["gerbers", "drills", "sch_pdf", "bom", "ibom", "pcb_pdf", "positions", "svg", ["ddd", "STEP"], ["ddd", "VRML"]],
   "kicad_python_path": "C:\\\\Program Files\\\\KiCad\\\\8.0\\\\bin\\\\python.exe",
   "ibom_path": "C:\\\\Users\\\\vishn\\\\Documents\\\\KiCad\\\\8.0\\\\3rdparty\\\\plugins\\\\org_openscopeproject_InteractiveHtmlBom\\\\generate_interactive_bom.py",
+  "kie_zip_compress_level": 6,
+  "kie_max_jobs": 0,
   "data": {
     "gerbers": {
       "--output_dir": "Export",
@@ -262,7 +302,7 @@ color = _color()
 
 #=============================================================================================#
 
-def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None):
+def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None, context = None):
   """
   Runs the KiCad iBOM Python script on a specified PCB file.
 
@@ -270,14 +310,15 @@ def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None):
     pcb_filename (str): Path to the KiCad PCB file (.kicad_pcb).
     output_dir (str): Directory to save the output files. Defaults to the PCB file's directory.
     extra_args (list): Additional command-line arguments for customization (optional).
+    context (ExportContext, optional): The information about the PCB file, if it is already known.
 
   Returns:
     str: Path to the generated iBOM HTML file.
   """
 
-  # Read the paths.
-  kicad_python_path = f'{current_config.get ("kicad_python_path", default_config ["kicad_python_path"])}'
-  ibom_path = f'{current_config.get ("ibom_path", default_config ["ibom_path"])}'
+  # Read the paths. Empty or null paths in the configuration also use the default paths.
+  kicad_python_path = current_config.get ("kicad_python_path") or default_config ["kicad_python_path"]
+  ibom_path = current_config.get ("ibom_path") or default_config ["ibom_path"]
 
   # Check if the KiCad Python path exists.
   if not os.path.isfile (kicad_python_path):
@@ -290,7 +331,7 @@ def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None):
     return
   
   # Construct the iBOM command.
-  ibom_export_command = [f'"{kicad_python_path}"', f'"{ibom_path}"']
+  ibom_export_command = [kicad_python_path, ibom_path]
 
   #---------------------------------------------------------------------------------------------#
   
@@ -301,25 +342,25 @@ def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None):
   
   #---------------------------------------------------------------------------------------------#
 
-  file_name = extract_pcb_file_name (pcb_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   
   print (f"generateiBoM() [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
   # ibom_filename = f"{project_name}-R{info ['rev']}-HTML-BoM-{filename_date}.html"
 
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  ibom_config = current_config.get ("data", {}).get ("bom", {}).get ("iBoM", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("bom", {}).get ("iBoM").get ("--output_dir", default_config ["data"]["bom"]["iBoM"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "bom", "iBoM", "--output_dir")))
   od_from_cli = output_dir  # The directory specified by the command line argument
 
   # Get the final directory path
@@ -332,67 +373,31 @@ def generateiBoM (output_dir = None, pcb_filename = None, extra_args = None):
   full_command = []
   full_command.extend (ibom_export_command) # Add the base command
   
-  seq_number = 1
-  not_completed = True
-  
-  # Create the output file name.
-  while not_completed:
-    file_name = f"{final_directory}/{project_name}-R{info ['rev']}-BoM-HTML-{filename_date}-{seq_number}.html" # Extension needed here
+  # Find the next available output file name.
+  file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-BoM-HTML-{filename_date}-", ".html")
+  file_name = os.path.splitext (file_name) [0] # No extension needed
 
-    if os.path.exists (file_name):
-      seq_number += 1
-      not_completed = True
-    else:
-      full_command.append ("--dest-dir")
-      full_command.append (f'"{final_directory}"') # Add the output file name with double quotes around it
-      full_command.append ("--name-format")
-      file_name = f"{project_name}-R{info ['rev']}-BoM-HTML-{filename_date}-{seq_number}" # No extension needed
-      full_command.append (f'"{file_name}"')
-      break
+  full_command.append ("--dest-dir")
+  full_command.append (final_directory) # Add the output file name
+  full_command.append ("--name-format")
+  full_command.append (file_name)
   
   #---------------------------------------------------------------------------------------------#
 
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("bom", {}).get ("iBoM")
+  arg_list = ibom_config
 
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-
-        elif key == "--name-format": # Skip the --name-format argument
-          continue
-        
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
+  full_command.extend (build_cli_args (arg_list, skip_keys = ("--output_dir", "--name-format")))
 
   # Finally add the input file
-  full_command.append (f'"{pcb_filename}"')
-  print ("generateBom [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (pcb_filename)
+  print ("generateBom [INFO]: Running command: ", color.blue (format_command (full_command)))
 
   #---------------------------------------------------------------------------------------------#
 
   # Run the iBOM script with error handling
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
     print (color.green (f"generateiBoM() [INFO]: Interactive HTML BoM generated successfully."))
 
@@ -413,6 +418,9 @@ def merge_pdfs (folder_path, output_file):
     folder_path (str): Path to the folder containing PDF files.
     output_file (str): Name of the output PDF file.
   """
+  # PyMuPDF is slow to import and only needed here, so import it when merging for the first time.
+  import pymupdf
+
   try:
     # List all PDF files in the specified folder.
     pdf_files = [f for f in os.listdir (folder_path) if f.endswith ('.pdf')]
@@ -459,9 +467,12 @@ def merge_pdfs (folder_path, output_file):
 
 #=============================================================================================#
 
-def generateGerbers (output_dir, pcb_filename, to_overwrite = True):
+def generateGerbers (output_dir, pcb_filename, to_overwrite = True, context = None):
+  # Get the configuration of this command only once.
+  gerbers_config = current_config.get ("data", {}).get ("gerbers", {})
+
   # Generate the drill files first if specified
-  kie_include_drill = current_config.get ("data", {}).get ("gerbers", {}).get ("kie_include_drill", default_config ["data"]["gerbers"]["kie_include_drill"])
+  kie_include_drill = get_config_value (("data", "gerbers", "kie_include_drill"))
 
   # Check if the value is boolean and then true or false
   if isinstance (kie_include_drill, bool):
@@ -473,12 +484,12 @@ def generateGerbers (output_dir, pcb_filename, to_overwrite = True):
     kie_include_drill = False
 
   if kie_include_drill == True:
-    generateDrills (output_dir, pcb_filename)
+    generateDrills (output_dir, pcb_filename, context = context)
   
   #---------------------------------------------------------------------------------------------#
   
   # Common base command
-  gerber_export_command = ["kicad-cli", "pcb", "export", "gerbers"]
+  gerber_export_command = [KICAD_CLI, "pcb", "export", "gerbers"]
 
   # Check if the pcb file exists
   if not check_file_exists (pcb_filename):
@@ -487,23 +498,20 @@ def generateGerbers (output_dir, pcb_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (pcb_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-  
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   print (f"generateGerbers [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
   
   #---------------------------------------------------------------------------------------------#
   
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("gerbers", {}).get ("--output_dir", default_config ["data"]["gerbers"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "gerbers", "--output_dir")))
   od_from_cli = output_dir  # The output directory specified by the command line argument
 
   # Get the final directory path.
@@ -512,58 +520,30 @@ def generateGerbers (output_dir, pcb_filename, to_overwrite = True):
   #---------------------------------------------------------------------------------------------#
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("gerbers", {})
+  arg_list = gerbers_config
 
-  seq_number = 1
-  not_completed = True
   full_command = []
   full_command.extend (gerber_export_command) # Add the base command
   full_command.append ("--output")
-  full_command.append (f'"{final_directory}"')
+  full_command.append (final_directory)
   
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-        elif key == "--layers":
-          full_command.append (key)
-          layers_csv = ",".join (value) # Convert the list to a comma-separated string
-          full_command.append (f'"{layers_csv}"')
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
+  full_command.extend (build_cli_args (arg_list))
+
   # Finally add the input file
-  full_command.append (f'"{pcb_filename}"')
-  print ("generateGerbers [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (pcb_filename)
+  print ("generateGerbers [INFO]: Running command: ", color.blue (format_command (full_command)))
   
   #---------------------------------------------------------------------------------------------#
   
   # Delete the existing files in the output directory
-  delete_files (final_directory, include_extensions = [".gbr", ".gbrjob"])
+  # The names of the remaining files are used for finding the next available file name.
+  remaining_names = delete_files (final_directory, include_extensions = [".gbr", ".gbrjob"])
   
   #---------------------------------------------------------------------------------------------#
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
     print (color.green ("generateGerbers [OK]: Gerber files exported successfully."))
   
@@ -578,32 +558,22 @@ def generateGerbers (output_dir, pcb_filename, to_overwrite = True):
   
   #---------------------------------------------------------------------------------------------#
   
-  seq_number = 1
-  not_completed = True
-
   files_to_include = [".gbr", ".gbrjob"]
 
   if kie_include_drill:
     files_to_include.extend ([".drl", ".ps", ".pdf"])
   
-  # Sequentially name and create the zip files.
-  while not_completed:
-    zip_file_name = f"{project_name}-R{info ['rev']}-Gerber-{filename_date}-{seq_number}.zip"
-
-    if os.path.exists (f"{final_directory}/{zip_file_name}"):
-      seq_number += 1
-    else:
-      # zip_all_files (final_directory, f"{final_directory}/{zip_file_name}")
-      zip_all_files_2 (final_directory, files_to_include, zip_file_name)
-      print (f"generateGerbers [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
-      print()
-      not_completed = False
+  # Sequentially name and create the zip file.
+  zip_file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-Gerber-{filename_date}-", ".zip", remaining_names)
+  zip_all_files_2 (final_directory, files_to_include, zip_file_name)
+  print (f"generateGerbers [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
+  print()
 
 #=============================================================================================#
 
-def generateDrills (output_dir, pcb_filename):
+def generateDrills (output_dir, pcb_filename, context = None):
   # Common base command
-  drill_export_command = ["kicad-cli", "pcb", "export", "drill"]
+  drill_export_command = [KICAD_CLI, "pcb", "export", "drill"]
 
   # Check if the pcb file exists
   if not check_file_exists (pcb_filename):
@@ -612,72 +582,47 @@ def generateDrills (output_dir, pcb_filename):
 
   #-------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (pcb_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-  
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   print (f"generateDrills [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
   
   #-------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  drills_config = current_config.get ("data", {}).get ("drills", {})
+
   # Read the target directory name from the config file
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("drills", {}).get ("--output_dir", default_config ["data"]["drills"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "drills", "--output_dir")))
   od_from_cli = output_dir  # The directory specified by the command line argument
 
   # Get the final directory path
   final_directory, filename_date = create_final_directory (od_from_config, od_from_cli, "Gerber", info ["rev"], "generateDrills")
 
-  # Check if the final directory ends with a slash, and add one if not.
-  if final_directory [-1] != "/":
-    final_directory = f"{final_directory}/"
+  # Make sure that the final directory ends with a separator, so that KiCad-CLI uses it as a directory.
+  final_directory = os.path.join (final_directory, "")
     
   #-------------------------------------------------------------------------------------------#
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("drills", {})
+  arg_list = drills_config
 
-  seq_number = 1
-  not_completed = True
   full_command = []
   full_command.extend (drill_export_command) # Add the base command
   full_command.append ("--output")
-  full_command.append (f'"{final_directory}"')
+  full_command.append (final_directory)
   
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
+  full_command.extend (build_cli_args (arg_list))
+
   # Finally add the input file
-  full_command.append (f'"{pcb_filename}"')
-  print ("generateDrills [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (pcb_filename)
+  print ("generateDrills [INFO]: Running command: ", color.blue (format_command (full_command)))
   
   #-------------------------------------------------------------------------------------------#
 
@@ -688,7 +633,6 @@ def generateDrills (output_dir, pcb_filename):
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
     print (color.green ("generateDrills [OK]: Drill files exported successfully."))
     print()
@@ -705,12 +649,12 @@ def generateDrills (output_dir, pcb_filename):
 
 #=============================================================================================#
 
-def generatePositions (output_dir, pcb_filename, to_overwrite = True):
+def generatePositions (output_dir, pcb_filename, to_overwrite = True, context = None):
   global current_config  # Access the global config
   global default_config  # Access the global config
   
   # Common base command
-  position_export_command = ["kicad-cli", "pcb", "export", "pos"]
+  position_export_command = [KICAD_CLI, "pcb", "export", "pos"]
 
   # Check if the input file exists
   if not check_file_exists (pcb_filename):
@@ -719,23 +663,23 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (pcb_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-  
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   print (f"generatePositions [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
   
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  positions_config = current_config.get ("data", {}).get ("positions", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("positions", {}).get ("--output_dir", default_config ["data"]["positions"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "positions", "--output_dir")))
   od_from_cli = output_dir  # The directory specified by the command line argument
 
   # Get the final directory path
@@ -743,9 +687,9 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
   
   #---------------------------------------------------------------------------------------------#
   
-  pos_front_filename = f"{final_directory}/{project_name}-Pos-Front.csv"
-  pos_back_filename = f"{final_directory}/{project_name}-Pos-Back.csv"
-  pos_all_filename = f"{final_directory}/{project_name}-Pos-All.csv"
+  pos_front_filename = os.path.join (final_directory, f"{project_name}-Pos-Front.csv")
+  pos_back_filename = os.path.join (final_directory, f"{project_name}-Pos-Back.csv")
+  pos_all_filename = os.path.join (final_directory, f"{project_name}-Pos-All.csv")
 
   # Create a list of filenames for front, back, and both.
   pos_filenames = [pos_front_filename, pos_back_filename, pos_all_filename]
@@ -755,11 +699,11 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
   for filename in pos_filenames:
       full_command = position_export_command.copy()  # Copy the base command
       full_command.append ("--output")
-      full_command.append (f'"{filename}"')
+      full_command.append (filename)
       full_command_list.append (full_command)
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("positions", {})
+  arg_list = positions_config
   sides = arg_list.get ("--side", None) # Get the sides from the config file as a string
 
   # Check if the sides are valid and apply the default value if not
@@ -767,46 +711,23 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
     print (color.yellow (f"generatePositions [INFO]: No sides specified. Using both sides."))
     sides = "both"
   
-  # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for i, command_set in enumerate (full_command_list):
-      for key, value in arg_list.items():
-        if key.startswith ("--"): # Only fetch the arguments that start with "--"
-          if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-            continue
-          elif key == "--side":
-            if sides.__contains__ ("front") and i == 0:
-              command_set.append (key)
-              command_set.append ("front")
-            elif sides.__contains__ ("back") and i == 1:
-              command_set.append (key)
-              command_set.append ("back")
-            elif sides.__contains__ ("both") and i == 2:
-              command_set.append (key)
-              command_set.append ("both")
-          else:
-            # Check if the value is empty
-            if value == "": # Skip if the value is empty
-              continue
-            else:
-              # Check if the vlaue is a JSON boolean
-              if isinstance (value, bool):
-                if value == True: # If the value is true, then append the key as an argument
-                  command_set.append (key)
-              else:
-                # Check if the value is a string and not a numeral
-                if isinstance (value, str) and not value.isdigit():
-                    command_set.append (key)
-                    command_set.append (f'"{value}"') # Add as a double-quoted string
-                elif isinstance (value, (int, float)):
-                    command_set.append (key)
-                    command_set.append (str (value))  # Append the numeric value as string
+  # The side is different for each command set, and the rest of the arguments are the same.
+  common_args = build_cli_args (arg_list, skip_keys = ("--output_dir", "--side"))
+
+  for i, command_set in enumerate (full_command_list):
+    if sides.__contains__ ("front") and i == 0:
+      command_set.extend (["--side", "front"])
+    elif sides.__contains__ ("back") and i == 1:
+      command_set.extend (["--side", "back"])
+    elif sides.__contains__ ("both") and i == 2:
+      command_set.extend (["--side", "both"])
+
+    command_set.extend (common_args) # Add the remaining arguments
 
   # Finally append the filename to the commands
   for command_set in full_command_list:
     # board_file_path = os.path.abspath (pcb_filename)
-    command_set.append (f'"{pcb_filename}"')
+    command_set.append (pcb_filename)
   
   #---------------------------------------------------------------------------------------------#
   
@@ -819,9 +740,8 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
   for i, full_command in enumerate (full_command_list):
     if (sides.__contains__ ("front") and i == 0) or (sides.__contains__ ("back") and i == 1) or (sides.__contains__ ("both") and i == 2):
       try:
-        command_string = ' '.join (full_command)  # Convert the list to a string
-        print (f"generatePositions [INFO]: Running command: {color.blue (command_string)}")
-        subprocess.run (command_string, check = True)
+        print (f"generatePositions [INFO]: Running command: {color.blue (format_command (full_command))}")
+        subprocess.run (full_command, check = True)
       except subprocess.CalledProcessError as e:
         print (color.red (f"generatePositions [ERROR]: Error occurred while generating the files."))
         return
@@ -835,28 +755,18 @@ def generatePositions (output_dir, pcb_filename, to_overwrite = True):
   
   #---------------------------------------------------------------------------------------------#
   
-  seq_number = 1
-  not_completed = True
-
   files_to_include = [".csv"]
   
-  # Sequentially name and create the zip files.
-  while not_completed:
-    zip_file_name = f"{project_name}-R{info ['rev']}-Position-Files-{filename_date}-{seq_number}.zip"
-
-    if os.path.exists (f"{final_directory}/{zip_file_name}"):
-      seq_number += 1
-    else:
-      # zip_all_files (final_directory, f"{final_directory}/{zip_file_name}")
-      zip_all_files_2 (final_directory, files_to_include, zip_file_name)
-      print (f"generatePositions [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
-      not_completed = False
+  # Sequentially name and create the zip file.
+  zip_file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-Position-Files-{filename_date}-", ".zip")
+  zip_all_files_2 (final_directory, files_to_include, zip_file_name)
+  print (f"generatePositions [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
 
 #=============================================================================================#
 
-def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True):
+def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True, context = None):
   # Common base command
-  pcb_pdf_export_command = ["kicad-cli", "pcb", "export", "pdf"]
+  pcb_pdf_export_command = [KICAD_CLI, "pcb", "export", "pdf"]
 
   # Check if the pcb file exists
   if not check_file_exists (pcb_filename):
@@ -865,23 +775,23 @@ def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
 
-  file_name = extract_pcb_file_name (pcb_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-  
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   print (f"generatePcbPdf [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
   
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  pcb_pdf_config = current_config.get ("data", {}).get ("pcb_pdf", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("pcb_pdf", {}).get ("--output_dir", default_config ["data"]["pcb_pdf"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "pcb_pdf", "--output_dir")))
   od_from_cli = output_dir  # The output directory specified by the command line argument
 
   # Get the final directory path
@@ -890,12 +800,13 @@ def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True):
   #---------------------------------------------------------------------------------------------#
   
   # Delete the existing files in the output directory
-  delete_files (final_directory, include_extensions = [".pdf", ".ps"])
+  # The names of the remaining files are used for finding the next available file name.
+  remaining_names = delete_files (final_directory, include_extensions = [".pdf", ".ps"])
 
   #---------------------------------------------------------------------------------------------#
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("pcb_pdf", {})
+  arg_list = pcb_pdf_config
 
   # Check the number of technical layers to export. This is not the number of copper layers.
   layer_count = len (arg_list.get ("--layers", []))
@@ -907,69 +818,55 @@ def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True):
   # Get the number of common layers to include in each of the PDF.
   # common_layer_count = len (arg_list.get ("kie_common_layers", []))
 
-  seq_number = 1
-  not_completed = True
+  seq_number = 1 # The merged PDF is always the first one, since the old files are deleted
   base_command = []
   base_command.extend (pcb_pdf_export_command) # Add the base command
-  
-  for i in range (layer_count):
+
+  # The arguments other than the output file and the layers are the same for every layer.
+  # So we only have to build them once, instead of going through the argument list for each layer.
+  common_args = build_cli_args (arg_list, skip_keys = ("--output_dir", "--layers"))
+
+  common_layer_list = arg_list.get ("kie_common_layers", [])  # The common layers are added to each of the PDF
+  layer_commands = [] # The commands for each layer
+
+  # Only the layer name changes in the output file names, so the rest is built only once.
+  layer_file_prefix = os.path.join (final_directory, f"{project_name}-R{info ['rev']}-")
+
+  for layer_name in arg_list ["--layers"]:
     full_command = base_command [:]
-    # Get the arguments.
-    if arg_list: # Check if the argument list is not an empty dictionary.
-      for key, value in arg_list.items():
-        if key.startswith ("--"): # Only fetch the arguments that start with "--"
-          if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-            continue
-          elif key == "--layers":
-            layer_name = arg_list ["--layers"][i] # Get a layer name from the layer list
-            layer_name = layer_name.replace (".", "_") # Replace dots with underscores
-            layer_name = layer_name.replace (" ", "_") # Replace spaces with underscores
-
-            full_command.append ("--output")
-            full_command.append (f'"{final_directory}/{project_name}-R{info ["rev"]}-{layer_name}.pdf"') # This is the ouput file name, and not a directory name
-
-            layer_name = arg_list ["--layers"][i] # Get a layer name from the layer list
-            layer_list = [f"{layer_name}"]  # Now create a list with the first item as the layer name
-            common_layer_list = arg_list ["kie_common_layers"]  # Add the common layers
-            layer_list.extend (common_layer_list) # Now combine the two lists
-            layers_csv = ",".join (layer_list) # Convert the list to a comma-separated string
-            full_command.append (key)
-            full_command.append (f'"{layers_csv}"')
-          else:
-            # Check if the value is empty
-            if value == "": # Skip if the value is empty
-              continue
-            else:
-              # Check if the vlaue is a JSON boolean
-              if isinstance (value, bool):
-                if value == True: # If the value is true, then append the key as an argument
-                  full_command.append (key)
-              else:
-                # Check if the value is a string and not a numeral
-                if isinstance (value, str) and not value.isdigit():
-                    full_command.append (key)
-                    full_command.append (f'"{value}"') # Add as a double-quoted string
-                elif isinstance (value, (int, float)):
-                    full_command.append (key)
-                    full_command.append (str (value))  # Append the numeric value as string
-
-    full_command.append (f'"{pcb_filename}"')
-    print ("generatePcbPdf [INFO]: Running command: ", color.blue (' '.join (full_command)))
-
-      # Run the command
-    try:
-      full_command = ' '.join (full_command) # Convert the list to a string
-      subprocess.run (full_command, check = True)
-      # print (color.green ("generatePcbPdf [OK]: PCB PDF files exported successfully."))
-    
-    except subprocess.CalledProcessError as e:
-      print (color.red (f"generatePcbPdf [ERROR]: Error occurred: {e}"))
-      continue
+
+    # Replace dots and spaces in the layer name with underscores to use it in the file name.
+    layer_file_name = layer_name.translate (LAYER_NAME_TRANS)
+
+    full_command.append ("--output")
+    full_command.append (layer_file_prefix + layer_file_name + ".pdf") # This is the ouput file name, and not a directory name
+
+    layers_csv = ",".join ([layer_name] + common_layer_list) # The layer and the common layers as a comma-separated string
+    full_command.append ("--layers")
+    full_command.append (layers_csv)
+
+    full_command.extend (common_args) # Add the rest of the arguments
+    full_command.append (pcb_filename)
+    print ("generatePcbPdf [INFO]: Running command: ", color.blue (format_command (full_command)))
+    layer_commands.append (full_command)
+
+  # Run the commands. Each layer is exported by a separate KiCad-CLI process, and they
+  # don't depend on each other. So we can run them in parallel instead of one by one.
+  # The number of layers exported at the same time is limited by kie_max_jobs, like the commands of run.
+  with ThreadPoolExecutor (max_workers = get_max_jobs ("generatePcbPdf")) as executor:
+    futures = [executor.submit (subprocess.run, command, check = True) for command in layer_commands]
+
+    for future in as_completed (futures):
+      try:
+        future.result()
+
+      except subprocess.CalledProcessError as e:
+        print (color.red (f"generatePcbPdf [ERROR]: Error occurred: {e}"))
   
   #---------------------------------------------------------------------------------------------#
   
   # # Generate a single file if specified
-  # kie_single_file = current_config.get ("data", {}).get ("pcb_pdf", {}).get ("kie_single_file", default_config ["data"]["pcb_pdf"]["kie_single_file"])
+  # kie_single_file = pcb_pdf_config.get ("kie_single_file", default_config ["data"]["pcb_pdf"]["kie_single_file"])
 
   # # Check if the value is boolean and then true or false
   # if isinstance (kie_single_file, bool):
@@ -995,32 +892,22 @@ def generatePcbPdf (output_dir, pcb_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
 
-  seq_number = 1
-  not_completed = True
-
   files_to_include = [".pdf"]
   
-  # Sequentially name and create the zip files.
-  while not_completed:
-    zip_file_name = f"{project_name}-R{info ['rev']}-PCB-PDF-{filename_date}-{seq_number}.zip"
-
-    if os.path.exists (f"{final_directory}/{zip_file_name}"):
-      seq_number += 1
-    else:
-      # zip_all_files (final_directory, f"{final_directory}/{zip_file_name}")
-      zip_all_files_2 (final_directory, files_to_include, zip_file_name)
-      print (f"generatePcbPdf [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
-      print()
-      not_completed = False
+  # Sequentially name and create the zip file.
+  zip_file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-PCB-PDF-{filename_date}-", ".zip", remaining_names)
+  zip_all_files_2 (final_directory, files_to_include, zip_file_name)
+  print (f"generatePcbPdf [OK]: ZIP file '{color.magenta (zip_file_name)}' created successfully.")
+  print()
 
 #=============================================================================================#
 
-def generateSchPdf (output_dir, sch_filename, to_overwrite = True):
+def generateSchPdf (output_dir, sch_filename, to_overwrite = True, context = None):
   global current_config  # Access the global config
   global default_config  # Access the global config
 
   # Common base command
-  sch_pdf_export_command = ["kicad-cli", "sch", "export", "pdf"]
+  sch_pdf_export_command = [KICAD_CLI, "sch", "export", "pdf"]
 
   # Check if the input file exists
   if not check_file_exists (sch_filename):
@@ -1029,24 +916,24 @@ def generateSchPdf (output_dir, sch_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (sch_filename) # Extract information from the input file
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (sch_filename) # Extract basic information from the input file
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (sch_filename)
+  project_name = context.project_name
+  info = context.info
 
   print (f"generateSchPdf [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
 
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (sch_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  sch_pdf_config = current_config.get ("data", {}).get ("sch_pdf", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("sch_pdf", {}).get ("--output_dir", default_config ["data"]["sch_pdf"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "sch_pdf", "--output_dir")))
   od_from_cli = output_dir  # The output directory specified by the command line argument
 
   # Get the final directory path.
@@ -1055,60 +942,27 @@ def generateSchPdf (output_dir, sch_filename, to_overwrite = True):
   #---------------------------------------------------------------------------------------------#
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("sch_pdf", {})
+  arg_list = sch_pdf_config
 
   full_command = []
   full_command.extend (sch_pdf_export_command) # Add the base command
 
-  seq_number = 1
-  not_completed = True
-  
-  # Create the output file name.
-  while not_completed:
-    file_name = f"{final_directory}/{project_name}-R{info ['rev']}-SCH-{filename_date}-{seq_number}.pdf"
+  # Find the next available output file name.
+  file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-SCH-{filename_date}-", ".pdf")
+  full_command.append ("--output")
+  full_command.append (os.path.join (final_directory, file_name)) # Add the output file name
 
-    if os.path.exists (file_name):
-      seq_number += 1 # Increment the sequence number and try again
-      not_completed = True
-    else:
-      full_command.append ("--output")
-      full_command.append (f'"{file_name}"') # Add the output file name with double quotes around it
-      break
-  
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
+  full_command.extend (build_cli_args (arg_list))
+
   # Finally add the input file
-  full_command.append (f'"{sch_filename}"')
-  print ("generateSchPdf [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (sch_filename)
+  print ("generateSchPdf [INFO]: Running command: ", color.blue (format_command (full_command)))
 
   #---------------------------------------------------------------------------------------------#
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
   
   except subprocess.CalledProcessError as e:
@@ -1119,14 +973,14 @@ def generateSchPdf (output_dir, sch_filename, to_overwrite = True):
 
 #=============================================================================================#
 
-def generate3D (output_dir, pcb_filename, type = "STEP", to_overwrite = True):
+def generate3D (output_dir, pcb_filename, type = "STEP", to_overwrite = True, context = None):
   # Common base command
   if type == "STEP" or type == "step":
-    ddd_export_command = ["kicad-cli", "pcb", "export", "step"]
+    ddd_export_command = [KICAD_CLI, "pcb", "export", "step"]
     type = "STEP"
     extension = "step"
   elif type == "VRML" or type == "vrml":
-    ddd_export_command = ["kicad-cli", "pcb", "export", "vrml"]
+    ddd_export_command = [KICAD_CLI, "pcb", "export", "vrml"]
     type = "VRML"
     extension = "wrl"
 
@@ -1136,24 +990,24 @@ def generate3D (output_dir, pcb_filename, type = "STEP", to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (pcb_filename) # Extract information from the input file
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
   
   print (f"generate3D [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
 
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  ddd_config = current_config.get ("data", {}).get ("ddd", {}).get (type, {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("ddd", {}).get (type, {}).get ("--output_dir", default_config ["data"]["ddd"][type]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "ddd", type, "--output_dir")))
   od_from_cli = output_dir  # The directory specified by the command line argument
 
   # Get the final directory path
@@ -1164,60 +1018,27 @@ def generate3D (output_dir, pcb_filename, type = "STEP", to_overwrite = True):
   full_command = []
   full_command.extend (ddd_export_command) # Add the base command
   
-  seq_number = 1
-  not_completed = True
-  
-  # Generate the file name.
-  while not_completed:
-    file_name = f"{final_directory}/{project_name}-R{info ['rev']}-{type}-{filename_date}-{seq_number}.{extension}"
-
-    if os.path.exists (file_name):
-      seq_number += 1
-      not_completed = True
-    else:
-      full_command.append ("--output")
-      full_command.append (f'"{file_name}"') # Add the output file name with double quotes around it
-      break
+  # Find the next available output file name.
+  file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-{type}-{filename_date}-", f".{extension}")
+  full_command.append ("--output")
+  full_command.append (os.path.join (final_directory, file_name)) # Add the output file name
   
   #---------------------------------------------------------------------------------------------#
   
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("ddd", {}).get (type)
+  arg_list = ddd_config
 
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
+  full_command.extend (build_cli_args (arg_list))
+
   # Finally add the input file
-  full_command.append (f'"{pcb_filename}"')
-  print ("generate3D [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (pcb_filename)
+  print ("generate3D [INFO]: Running command: ", color.blue (format_command (full_command)))
 
   #---------------------------------------------------------------------------------------------#
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
   
   except subprocess.CalledProcessError as e:
@@ -1228,9 +1049,9 @@ def generate3D (output_dir, pcb_filename, type = "STEP", to_overwrite = True):
 
 #=============================================================================================#
 
-def generateBom (output_dir, sch_filename, type, to_overwrite = True):
+def generateBom (output_dir, sch_filename, type, to_overwrite = True, context = None):
   # Common base command
-  bom_export_command = ["kicad-cli", "sch", "export", "bom"]
+  bom_export_command = [KICAD_CLI, "sch", "export", "bom"]
 
   # Check if the input file exists
   if not check_file_exists (sch_filename):
@@ -1239,24 +1060,24 @@ def generateBom (output_dir, sch_filename, type, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (sch_filename)
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-  
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (sch_filename)
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (sch_filename)
+  project_name = context.project_name
+  info = context.info
   
   print (f"generateBom [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
 
   #---------------------------------------------------------------------------------------------#
   
-  file_path = os.path.abspath (sch_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  bom_config = current_config.get ("data", {}).get ("bom", {}).get ("CSV", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("bom", {}).get ("CSV").get ("--output_dir", default_config ["data"]["bom"]["CSV"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "bom", "CSV", "--output_dir")))
   od_from_cli = output_dir  # The output directory specified by the command line argument
 
   # Get the final directory path.
@@ -1267,60 +1088,27 @@ def generateBom (output_dir, sch_filename, type, to_overwrite = True):
   full_command = []
   full_command.extend (bom_export_command) # Add the base command
   
-  seq_number = 1
-  not_completed = True
-  
-  # Create the output file name.
-  while not_completed:
-    file_name = f"{final_directory}/{project_name}-R{info ['rev']}-BoM-CSV-{filename_date}-{seq_number}.csv"
-
-    if os.path.exists (file_name):
-      seq_number += 1
-      not_completed = True
-    else:
-      full_command.append ("--output")
-      full_command.append (f'"{file_name}"') # Add the output file name with double quotes around it
-      break
+  # Find the next available output file name.
+  file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-BoM-CSV-{filename_date}-", ".csv")
+  full_command.append ("--output")
+  full_command.append (os.path.join (final_directory, file_name)) # Add the output file name
 
   #---------------------------------------------------------------------------------------------#
 
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("bom", {}).get ("CSV")
+  arg_list = bom_config
 
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
+  full_command.extend (build_cli_args (arg_list))
+
   # Finally add the input file
-  full_command.append (f'"{sch_filename}"')
-  print ("generateBom [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (sch_filename)
+  print ("generateBom [INFO]: Running command: ", color.blue (format_command (full_command)))
 
   #---------------------------------------------------------------------------------------------#
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
   
   except subprocess.CalledProcessError as e:
@@ -1331,9 +1119,9 @@ def generateBom (output_dir, sch_filename, type, to_overwrite = True):
 
 #=============================================================================================#
 
-def generateSvg (output_dir, pcb_filename, to_overwrite = True):
+def generateSvg (output_dir, pcb_filename, to_overwrite = True, context = None):
   # Common base command
-  svg_pdf_export_command = ["kicad-cli", "pcb", "export", "svg"]
+  svg_pdf_export_command = [KICAD_CLI, "pcb", "export", "svg"]
 
   # Check if the input file exists
   if not check_file_exists (pcb_filename):
@@ -1342,24 +1130,24 @@ def generateSvg (output_dir, pcb_filename, to_overwrite = True):
 
   #---------------------------------------------------------------------------------------------#
   
-  file_name = extract_pcb_file_name (pcb_filename) # Extract information from the input file
-  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
-
-  project_name = extract_project_name (file_name)
-  info = extract_info_from_pcb (pcb_filename) # Extract basic information from the input file
+  # Get the project name, revision and directory of the input file, unless they are already given.
+  if context is None:
+    context = prepare_export_context (pcb_filename)
+  project_name = context.project_name
+  info = context.info
 
   print (f"generateSvg [INFO]: Project name is '{color.magenta (project_name)}' and revision is {color.magenta ('R')}{color.magenta (info ['rev'])}.")
 
   #---------------------------------------------------------------------------------------------#
 
-  file_path = os.path.abspath (pcb_filename) # Get the absolute path of the file.
-
-  # Get the directory path of the file and save it as the project directory.
   # All other export directories will be relative to the project directory.
-  project_dir = os.path.dirname (file_path)
+  project_dir = context.project_dir
   
+  # Get the configuration of this command only once.
+  svg_config = current_config.get ("data", {}).get ("svg", {})
+
   # Read the output directory name from the config file.
-  od_from_config = project_dir + "/" + current_config.get ("data", {}).get ("svg", {}).get ("--output_dir", default_config ["data"]["svg"]["--output_dir"])
+  od_from_config = os.path.join (project_dir, get_config_value (("data", "svg", "--output_dir")))
   od_from_cli = output_dir  # The output directory specified by the command line argument
 
   # Get the final directory path.
@@ -1367,72 +1155,34 @@ def generateSvg (output_dir, pcb_filename, to_overwrite = True):
   
   #---------------------------------------------------------------------------------------------#
 
-  # Delete the existing files in the output directory
-  delete_files (final_directory, include_extensions = [".svg"])
+  # Delete the existing SVG files in the output directory, so that only the latest export is kept.
+  # The names of the remaining files are used for finding the next available file name.
+  remaining_names = delete_files (final_directory, include_extensions = [".svg"])
 
   #---------------------------------------------------------------------------------------------#
-  
+
   # Get the argument list from the config file.
-  arg_list = current_config.get ("data", {}).get ("svg", {})
+  arg_list = svg_config
 
   full_command = []
   full_command.extend (svg_pdf_export_command) # Add the base command
 
-  seq_number = 1
-  not_completed = True
-  
-  # Create the output file name.
-  while not_completed:
-    file_name = f"{final_directory}/{project_name}-R{info ['rev']}-SVG-{filename_date}-{seq_number}.svg"
-
-    if os.path.exists (file_name):
-      seq_number += 1 # Increment the sequence number and try again
-      not_completed = True
-    else:
-      full_command.append ("--output")
-      full_command.append (f'"{file_name}"') # Add the output file name with double quotes around it
-      break
+  # Find the next available output file name.
+  file_name = next_available_name (final_directory, f"{project_name}-R{info ['rev']}-SVG-{filename_date}-", ".svg", remaining_names)
+  full_command.append ("--output")
+  full_command.append (os.path.join (final_directory, file_name)) # Add the output file name
   
   # Add the remaining arguments.
-  # Check if the argument list is not an empty dictionary.
-  if arg_list:
-    for key, value in arg_list.items():
-      if key.startswith ("--"): # Only fetch the arguments that start with "--"
-        if key == "--output_dir": # Skip the --output_dir argument, sice we already added it
-          continue
+  full_command.extend (build_cli_args (arg_list))
 
-        elif key == "--layers":
-          full_command.append (key)
-          layers_csv = ",".join (value) # Convert the list to a comma-separated string
-          full_command.append (f'"{layers_csv}"')
-        
-        else:
-          # Check if the value is empty
-          if value == "": # Skip if the value is empty
-            continue
-          else:
-            # Check if the vlaue is a JSON boolean
-            if isinstance (value, bool):
-              if value == True: # If the value is true, then append the key as an argument
-                full_command.append (key)
-            else:
-              # Check if the value is a string and not a numeral
-              if isinstance (value, str) and not value.isdigit():
-                  full_command.append (key)
-                  full_command.append (f'"{value}"') # Add as a double-quoted string
-              elif isinstance (value, (int, float)):
-                  full_command.append (key)
-                  full_command.append (str (value))  # Append the numeric value as string
-  
   # Finally add the input file
-  full_command.append (f'"{pcb_filename}"')
-  print ("generateSvg [INFO]: Running command: ", color.blue (' '.join (full_command)))
+  full_command.append (pcb_filename)
+  print ("generateSvg [INFO]: Running command: ", color.blue (format_command (full_command)))
 
   #---------------------------------------------------------------------------------------------#
   
   # Run the command
   try:
-    full_command = ' '.join (full_command) # Convert the list to a string
     subprocess.run (full_command, check = True)
   
   except subprocess.CalledProcessError as e:
@@ -1443,6 +1193,73 @@ def generateSvg (output_dir, pcb_filename, to_overwrite = True):
 
 #=============================================================================================#
 
+def format_command (command):
+  """
+  Formats a command argument list as a single string for printing. The quoting follows the
+  rules of the platform, so the printed command can be copied and run in the shell.
+
+  Args:
+    command (list of str): The command and its arguments.
+
+  Returns:
+    str: The command as a single string.
+  """
+  if os.name == "nt":
+    return subprocess.list2cmdline (command)
+
+  return shlex.join (command)
+
+#=============================================================================================#
+
+def build_cli_args (arg_list, skip_keys = ("--output_dir",)):
+  """
+  Converts the arguments from the configuration file into a list of KiCad-CLI arguments.
+  Only the keys starting with "--" are used. JSON booleans are added as flags when true,
+  and the strings and numbers are added as values after the key. Lists are added as
+  comma-separated values, for example the layer list.
+
+  Args:
+    arg_list (dict): The argument dictionary of a command from the configuration file.
+    skip_keys (tuple of str, optional): The keys that are handled by the caller and should be skipped.
+
+  Returns:
+    list of str: The list of arguments.
+  """
+  cli_args = []
+
+  # Check if the argument list is not an empty dictionary.
+  if not arg_list:
+    return cli_args
+
+  for key, value in arg_list.items():
+    if key.startswith ("--"): # Only fetch the arguments that start with "--"
+      if key in skip_keys: # Skip the arguments that are added by the caller
+        continue
+      else:
+        # Check if the value is empty
+        if value == "": # Skip if the value is empty
+          continue
+        else:
+          # Check if the vlaue is a JSON boolean
+          if isinstance (value, bool):
+            if value == True: # If the value is true, then append the key as an argument
+              cli_args.append (key)
+          else:
+            # Check if the value is a string and not a numeral
+            if isinstance (value, str) and not value.isdigit():
+                cli_args.append (key)
+                cli_args.append (value) # Add the string value as it is
+            elif isinstance (value, (int, float)):
+                cli_args.append (key)
+                cli_args.append (str (value))  # Append the numeric value as string
+            elif isinstance (value, list):
+                cli_args.append (key)
+                cli_args.append (",".join (value)) # Convert the list to a comma-separated string
+
+  return cli_args
+
+#=============================================================================================#
+
 def create_final_directory (dir_from_config, dir_from_cli, target_dir_name, rev, func_name, to_overwrite = True):
   # This will be the root directory for the output files.
   # Extra directories will be created based on the revision, date and sequence number.
@@ -1456,44 +1273,49 @@ def create_final_directory (dir_from_config, dir_from_cli, target_dir_name, rev,
     print (f"{func_name} [INFO]: CLI directory '{color.magenta (dir_from_config)}' is not empty. Using the CLI directory.")
     target_dir = dir_from_config # Otherwise, use the command line argument
 
-  if not os.path.exists (target_dir): # Check if the target directory exists
-    print (f"{func_name} [INFO]: Output directory '{color.magenta (target_dir)}' does not exist. Creating it now.")
+  # Try to create the target directory straight away instead of checking for it first.
+  try:
     os.makedirs (target_dir)
-  else:
+    print (f"{func_name} [INFO]: Output directory '{color.magenta (target_dir)}' did not exist. Created it now.")
+  except FileExistsError:
     print (f"{func_name} [INFO]: Output directory '{color.magenta (target_dir)}' already exists.")
 
   #---------------------------------------------------------------------------------------------#
 
   # Create one more directory based on the revision number.
-  rev_directory = f"{target_dir}/R{rev}"
+  rev_directory = os.path.join (target_dir, f"R{rev}")
 
-  # Check if the revision directory exists, and create if not.
-  if not os.path.exists (rev_directory):
-    print (f"{func_name} [INFO]: Revision directory '{color.magenta (rev_directory)}' does not exist. Creating it now.")
+  # Create the revision directory if it does not exist yet.
+  try:
     os.makedirs (rev_directory)
+    print (f"{func_name} [INFO]: Revision directory '{color.magenta (rev_directory)}' did not exist. Created it now.")
+  except FileExistsError:
+    pass
   
   #---------------------------------------------------------------------------------------------#
   
   not_completed = True
   seq_number = 0
+
+  # Get the date only once so that all of the names use the same date, even across midnight.
+  today_date = datetime.now()
+  # formatted_date = today_date.strftime ("%d-%m-%Y")
+  formatted_date = today_date.strftime ("%Y-%m-%d")
+  filename_date = today_date.strftime ("%d%m%Y")
   
   # Now we have to make the date-specific and output-specific directory.
   # This will be the final directory for the output files.
   while not_completed:
-    today_date = datetime.now()
-    # formatted_date = today_date.strftime ("%d-%m-%Y")
-    formatted_date = today_date.strftime ("%Y-%m-%d")
-    filename_date = today_date.strftime ("%d%m%Y")
     seq_number += 1
     # date_directory = f"{rev_directory}/[{seq_number}] {formatted_date}"
-    date_directory = f"{rev_directory}/{formatted_date}"
-    final_directory = f"{date_directory}/{target_dir_name}"
+    date_directory = os.path.join (rev_directory, formatted_date)
+    final_directory = os.path.join (date_directory, target_dir_name)
 
-    if not os.path.exists (final_directory):
-      print (f"{func_name} [INFO]: Target directory '{color.magenta (final_directory)}' does not exist. Creating it now.")
+    try:
       os.makedirs (final_directory)
+      print (f"{func_name} [INFO]: Target directory '{color.magenta (final_directory)}' did not exist. Created it now.")
       not_completed = False
-    else:
+    except FileExistsError:
       if to_overwrite:
         print (f"{func_name} [INFO]: Target directory '{color.magenta (final_directory)}' already exists. Files may be overwritten.")
         not_completed = False
@@ -1505,6 +1327,72 @@ def create_final_directory (dir_from_config, dir_from_cli, target_dir_name, rev,
 
 #=============================================================================================#
 
+def next_available_name (directory, name_prefix, name_suffix, existing_names = None):
+  """
+  Finds the next file name in the form <name_prefix><seq_number><name_suffix>. The sequence number
+  is one more than the highest existing one, or 1 if there are none. The directory is read only once,
+  and the gaps left by deleted files are not reused.
+
+  Args:
+    directory (str): The directory where the file will be created.
+    name_prefix (str): The part of the file name before the sequence number.
+    name_suffix (str): The part of the file name after the sequence number, including the extension.
+    existing_names (set of str, optional): A snapshot of the names in the directory, like the one
+      returned by delete_files(). The directory is not read again if this is given, and the
+      returned name is added to it.
+
+  Returns:
+    str: The available file name without the directory path.
+  """
+  if existing_names is None:
+    with os.scandir (directory) as entries:
+      existing_names = {entry.name for entry in entries if entry.name.startswith (name_prefix)}
+
+  seq_number = 1
+  prefix_length = len (name_prefix)
+  suffix_length = len (name_suffix)
+
+  # Find the highest sequence number in the existing names.
+  for name in existing_names:
+    if name.startswith (name_prefix) and name.endswith (name_suffix):
+      number = name [prefix_length:len (name) - suffix_length]
+      if number.isdecimal(): # isdigit() would also accept characters like "²" that int() rejects
+        seq_number = max (seq_number, int (number) + 1)
+
+  file_name = f"{name_prefix}{seq_number}{name_suffix}"
+  existing_names.add (file_name) # Reserve the name in the snapshot
+
+  return file_name
+
+#=============================================================================================#
+
+def resolve_zip_compression (compress_level, func_name):
+  """
+  Finds the compression method and level for a ZIP file. Invalid levels use ZIP_COMPRESS_LEVEL.
+
+  Args:
+    compress_level (int): Deflate level from 0 to 9. 0 stores the files without compression.
+      If None, 'kie_zip_compress_level' from the configuration is used.
+    func_name (str): The name of the calling function, for the log messages.
+
+  Returns:
+    tuple: The compression method and the compression level for zipfile.ZipFile.
+  """
+  if compress_level is None:
+    compress_level = get_config_value (("kie_zip_compress_level",))
+
+  # Lower levels are faster, and higher levels make smaller files.
+  if isinstance (compress_level, bool) or not isinstance (compress_level, int) or not 0 <= compress_level <= 9:
+    print (color.yellow (f"{func_name} [WARNING]: Invalid ZIP compression level '{compress_level}'. Using {ZIP_COMPRESS_LEVEL}."))
+    compress_level = ZIP_COMPRESS_LEVEL
+
+  # Level 0 only stores the files, so skip the deflate step completely.
+  compression = zipfile.ZIP_STORED if compress_level == 0 else zipfile.ZIP_DEFLATED
+
+  return compression, compress_level
+
+#=============================================================================================#
+
 def zip_all_files (source_folder, zip_file_path):
   """
   Compresses all files from a folder into a ZIP file.
@@ -1513,7 +1401,9 @@ def zip_all_files (source_folder, zip_file_path):
       source_folder (str): Path to the folder containing files.
       zip_file_path (str): Path where the ZIP file will be saved.
   """
-  with zipfile.ZipFile (zip_file_path, 'w') as zipf:
+  compression, compress_level = resolve_zip_compression (None, "zip_all_files")
+
+  with zipfile.ZipFile (zip_file_path, 'w', compression = compression, compresslevel = compress_level, allowZip64 = True) as zipf:
     for foldername, subfolders, filenames in os.walk (source_folder):
       for filename in filenames:
         file_path = os.path.join (foldername, filename)
@@ -1525,32 +1415,60 @@ def zip_all_files (source_folder, zip_file_path):
 
 # ============================================================================================#
 
-def zip_all_files_2 (source_folder, extensions = None, zip_file_name = None):
+def zip_all_files_2 (source_folder, extensions = None, zip_file_name = None, compress_level = None):
     """
     Compresses files from a folder into a ZIP file, including only files with specified extensions.
+    Subfolders are not included. The extensions are matched case-insensitively.
 
     Args:
         source_folder (str): Path to the folder containing files.
         extensions (list of str, optional): List of file extensions to include (e.g., ['.txt', '.jpg']).
         zip_file_name (str, optional): Name of the ZIP file. If None, will use 'archive.zip'.
+        compress_level (int, optional): Deflate level from 0 to 9. 0 stores the files without compression.
+            If None, will use 'kie_zip_compress_level' from the configuration.
     """
     if extensions is None:
         extensions = []  # Include all files if no extensions are specified
     
     if zip_file_name is None:
         zip_file_name = 'archive.zip'  # Default ZIP file name
+
+    compression, compress_level = resolve_zip_compression (compress_level, "zip_all_files_2")
     
     zip_file_path = os.path.join (source_folder, zip_file_name)
+    temp_zip_file_path = os.path.join (source_folder, f".tmp_{zip_file_name}")  # Written first and then renamed
+    # The paths from os.scandir() are joined to the source folder in the same way,
+    # so they can be compared directly without resolving each of them.
+    zip_file_paths = {zip_file_path, temp_zip_file_path}
+    extension_set = {ext.lower() for ext in extensions}  # For constant time lookups
     
-    with zipfile.ZipFile (zip_file_path, 'w') as zipf:
-        for foldername, subfolders, filenames in os.walk (source_folder):
-            for filename in filenames:
-                file_path = os.path.join (foldername, filename)
-                # Check if the file has one of the specified extensions
-                if not extensions or any (filename.endswith (ext) for ext in extensions):
+    try:
+        # Write the ZIP file through a large buffer to reduce the number of write calls.
+        with open (temp_zip_file_path, 'wb', buffering = ZIP_WRITE_BUFFER_SIZE) as zip_file, \
+             zipfile.ZipFile (zip_file, 'w', compression = compression, compresslevel = compress_level, allowZip64 = True) as zipf:
+            # The output folders are flat, so a single directory read is enough.
+            with os.scandir (source_folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    # Check if the file has one of the specified extensions
+                    if extension_set and os.path.splitext (entry.name) [1].lower() not in extension_set:
+                        continue
                     # Exclude the ZIP file itself from being added
-                    if os.path.abspath (file_path) != os.path.abspath (zip_file_path):
-                        zipf.write (file_path, arcname = os.path.relpath (file_path, source_folder))
+                    if entry.path in zip_file_paths:
+                        continue
+                    zipf.write (entry.path, arcname = entry.name)
+
+        # Rename the complete ZIP file to the final name, so that a failed run never leaves a partial ZIP file.
+        os.replace (temp_zip_file_path, zip_file_path)
+
+    except BaseException:
+        # Remove the partial ZIP file if anything failed, and then pass the error on.
+        try:
+            os.remove (temp_zip_file_path)
+        except FileNotFoundError:
+            pass
+        raise
     
     # print(f"ZIP file created: {zip_file_name}")
 
@@ -1563,11 +1481,15 @@ def delete_non_zip_files (directory):
   Args:
     directory (str): Path to the directory where the cleanup will occur.
   """
-  for filename in os.listdir (directory):
-    file_path = os.path.join (directory, filename)
-    if os.path.isfile (file_path) and not filename.endswith ('.zip'):
-      os.remove (file_path)
-      # print(f"Deleted: {filename}")
+  # The directory entries already know whether they are files, so no extra stat() is needed.
+  with os.scandir (directory) as entries:
+    for entry in entries:
+      if entry.is_file() and not entry.name.endswith ('.zip'):
+        try:
+          os.remove (entry.path)
+        except FileNotFoundError:
+          pass # The file is already gone, which is what we wanted
+        # print(f"Deleted: {entry.name}")
 
 #=============================================================================================#
 
@@ -1587,15 +1509,20 @@ def delete_files_with_extensions (directory, extensions = None):
         extensions = extensions.split (',')
 
     # Ensure all extensions are in the form of '.ext'
-    extensions = [f".{ext.strip()}" for ext in extensions]
-
-    for filename in os.listdir (directory):
-        file_path = os.path.join (directory, filename)
-        if os.path.isfile (file_path):
-            # Check if file extension matches one of the provided extensions
-            if any (filename.endswith (ext) for ext in extensions):
-                os.remove (file_path)
-                # print(f"Deleted: {filename}")
+    # A tuple can be passed to str.endswith() directly to check all of the extensions at once.
+    extensions = tuple (f".{ext.strip()}" for ext in extensions)
+
+    # The directory entries already know whether they are files, so no extra stat() is needed.
+    with os.scandir (directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                # Check if file extension matches one of the provided extensions
+                if entry.name.endswith (extensions):
+                    try:
+                        os.remove (entry.path)
+                    except FileNotFoundError:
+                        pass # The file is already gone, which is what we wanted
+                    # print(f"Deleted: {entry.name}")
 
 #=============================================================================================#
 
@@ -1607,27 +1534,47 @@ def delete_files (directory, include_extensions = None, exclude_extensions = Non
         directory (str): Path to the directory where the cleanup will occur.
         include_extensions (list of str, optional): List of file extensions to include for deletion, e.g., ['.txt', '.jpg'].
         exclude_extensions (list of str, optional): List of file extensions to exclude from deletion, e.g., ['.zip'].
+
+    Returns:
+        set of str: Names of the entries left in the directory after the cleanup.
     """
     # Ensure inclusion and exclusion lists are properly formatted
     if include_extensions is None:
         include_extensions = []
     # Ensure that include_extensions have leading dots and are unique
-    include_extensions = [ext.strip().lower() for ext in include_extensions if ext.startswith('.')]
+    include_extensions = frozenset (ext.strip().lower() for ext in include_extensions if ext.startswith('.'))
     
     if exclude_extensions is None:
         exclude_extensions = []
     # Ensure that exclude_extensions have leading dots and are unique
-    exclude_extensions = [ext.strip().lower() for ext in exclude_extensions if ext.startswith('.')]
-
-    for filename in os.listdir (directory):
-        file_path = os.path.join (directory, filename)
-        if os.path.isfile (file_path):
-            # Get the file extension
-            file_ext = os.path.splitext (filename) [1].lower()
-            # Check if file extension is in the inclusion list and not in the exclusion list
-            if (not include_extensions or file_ext in include_extensions) and (file_ext not in exclude_extensions):
-                os.remove(file_path)
-                # print(f"Deleted: {filename}")
+    exclude_extensions = frozenset (ext.strip().lower() for ext in exclude_extensions if ext.startswith('.'))
+
+    remaining_names = set()  # The callers can reuse this instead of reading the directory again
+
+    # Without any extension filters, all of the files are deleted and the extensions don't have to be checked.
+    check_extensions = bool (include_extensions or exclude_extensions)
+    to_delete = True
+
+    # Scan the directory only once. The directory entries already know whether they are files.
+    with os.scandir (directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                if check_extensions:
+                    # Get the file extension
+                    file_ext = os.path.splitext (entry.name) [1].lower()
+                    # Check if file extension is in the inclusion list and not in the exclusion list
+                    to_delete = (not include_extensions or file_ext in include_extensions) and (file_ext not in exclude_extensions)
+
+                if to_delete:
+                    try:
+                        os.remove (entry.path)
+                    except FileNotFoundError:
+                        pass # The file is already gone, which is what we wanted
+                    # print(f"Deleted: {entry.name}")
+                    continue
+            remaining_names.add (entry.name)
+
+    return remaining_names
 
 #=============================================================================================#
 
@@ -1648,35 +1595,58 @@ def rename_files (directory, prefix, revision = "", extensions = None):
   if extensions is None:
     extensions = [] # All file types will be considered if no extension filter is specified
 
-  for filename in os.listdir (directory):
-    # Check if the filename starts with the prefix and ends with a valid extension (or any extension if none specified)
-    if filename.startswith (prefix) and (not extensions or any (filename.endswith (ext) for ext in extensions)):
-      # Construct the new filename with the revision tag
-      base_name = filename [len (prefix):]  # Remove the prefix part
-      new_filename = f"{prefix}-R{revision}{base_name}"
-      
-      # Full paths for renaming
-      old_file_path = os.path.join (directory, filename)
-      new_file_path = os.path.join (directory, new_filename)
-      
-      # Rename the file
-      os.rename (old_file_path, new_file_path)
-      # print(f"Renamed: {filename} -> {new_filename}")
+  extensions = tuple (extensions) # For checking all of the extensions with a single str.endswith() call
+
+  # These are the same for every file.
+  prefix_length = len (prefix)
+  new_prefix = f"{prefix}-R{revision}"
+
+  # Read the whole directory before renaming anything. Otherwise, the renamed files could show up
+  # in the same scan again, since they also start with the prefix.
+  with os.scandir (directory) as entries:
+    entries = list (entries)
+
+  # Where it is supported (not on Windows), open the directory once and rename the files relative to it.
+  # Then the directory path doesn't have to be resolved again for every file.
+  dir_fd = os.open (directory, os.O_RDONLY) if os.rename in os.supports_dir_fd else None
+
+  try:
+    for entry in entries:
+      filename = entry.name
+      # Check if the filename starts with the prefix and ends with a valid extension (or any extension if none specified)
+      if filename.startswith (prefix) and (not extensions or filename.endswith (extensions)):
+        # Construct the new filename with the revision tag
+        base_name = filename [prefix_length:]  # Remove the prefix part
+        new_filename = new_prefix + base_name
+        
+        # Rename the file
+        if dir_fd is None:
+          os.rename (entry.path, os.path.join (directory, new_filename))
+        else:
+          os.rename (filename, new_filename, src_dir_fd = dir_fd, dst_dir_fd = dir_fd)
+        # print(f"Renamed: {filename} -> {new_filename}")
+
+  finally:
+    if dir_fd is not None:
+      os.close (dir_fd)
 
 #=============================================================================================#
 
+@cache
 def check_file_exists (file_name):
   """
   Checks if the input PCB file exists.
+  The result is cached since the same input files are checked by every command in a run.
   Args:
     input_file_name (str): The path to the PCB file.
   Returns:
     bool: True if the file exists, False otherwise.
   """
-  return os.path.exists (file_name)
+  return os.access (file_name, os.F_OK)
 
 #=============================================================================================#
 
+@cache
 def extract_project_name (file_name):
   """
   Extracts the project name from a given PCB file name by removing the extension.
@@ -1708,38 +1678,72 @@ def extract_pcb_file_name (file_name):
 def extract_info_from_pcb (pcb_file_path):
   """
   Extracts specific information from a KiCad PCB file.
+  The results are cached by the path, modification time and size of the file. So an unchanged
+  file is only read once, even if multiple commands use it, and a modified file is read again.
+  Args:
+    pcb_file_path (str): Path to the KiCad PCB file.
+  Returns:
+    dict: A dictionary containing the extracted information.
+  """
+  try:
+    file_stat = os.stat (pcb_file_path)
+  except FileNotFoundError:
+    print (f"Error: The file '{pcb_file_path}' does not exist.")
+    return {}
+
+  # Use the absolute path for the cache, so that the relative and absolute paths of the same file share an entry.
+  return read_info_from_pcb (os.path.abspath (pcb_file_path), file_stat.st_mtime_ns, file_stat.st_size)
+
+#=============================================================================================#
+
+def find_pcb_info (content, info):
+  """
+  Finds the title block fields in the content of a KiCad PCB file and adds them to the info dictionary.
+  Only the first match of each field is stored, and the fields already in the dictionary are not changed.
+  Args:
+    content (bytes or mmap): The content of the file, or a part of it.
+    info (dict): The dictionary to store the information.
+  """
+  # Find all of the fields in a single pass and store the first match of each in the dictionary.
+  for match in PCB_INFO_PATTERN.finditer (content):
+    key = PCB_INFO_KEYS [match.group (1)]
+    if key not in info:
+      info [key] = match.group (2).decode ("utf-8") # Only the values have to be decoded
+      # The title block is at the start of the file, so we can stop once all of the fields are found.
+      if len (info) == len (PCB_INFO_KEYS):
+        break
+
+#=============================================================================================#
+
+# Only the recent versions of the files are kept, since every modification of a file adds a new entry.
+@lru_cache (maxsize = 32)
+def read_info_from_pcb (pcb_file_path, mtime_ns, size):
+  """
+  Reads the title block information from a KiCad PCB file. This is the cached part of
+  extract_info_from_pcb(), which should be used instead of calling this directly.
   Args:
     pcb_file_path (str): Path to the KiCad PCB file.
+    mtime_ns (int): The modification time of the file in nanoseconds. Only used for caching.
+    size (int): The size of the file in bytes.
   Returns:
     dict: A dictionary containing the extracted information.
   """
   info = {}
-  
+
+  # An empty file can not be memory-mapped, and has nothing to extract anyway.
+  if size == 0:
+    return info
+
   try:
-    with open (pcb_file_path, 'r', encoding = "utf-8") as file:
-      content = file.read()
-    
-    # Regular expressions to extract information
-    title_match = re.search (r'\(title "([^"]+)"\)', content)
-    date_match = re.search (r'\(date "([^"]+)"\)', content)
-    rev_match = re.search (r'\(rev "([^"]+)"\)', content)
-    company_match = re.search (r'\(company "([^"]+)"\)', content)
-    comment1_match = re.search (r'\(comment 1 "([^"]+)"\)', content)
-    comment2_match = re.search (r'\(comment 2 "([^"]+)"\)', content)
-    
-    # Store matches in the dictionary
-    if title_match:
-      info ['title'] = title_match.group (1)
-    if date_match:
-      info ['date'] = date_match.group (1)
-    if rev_match:
-      info ['rev'] = rev_match.group (1)
-    if company_match:
-      info ['company'] = company_match.group (1)
-    if comment1_match:
-      info ['comment1'] = comment1_match.group (1)
-    if comment2_match:
-      info ['comment2'] = comment2_match.group (1)
+    with open (pcb_file_path, 'rb') as file:
+      # The title block is at the start of the file. So search only the header first.
+      find_pcb_info (file.read (PCB_HEADER_SIZE), info)
+
+      # If some of the fields are not in the header, search the whole file.
+      # Map the file instead of reading all of it. Only the pages that are searched are read from the disk.
+      if len (info) < len (PCB_INFO_KEYS) and size > PCB_HEADER_SIZE:
+        with mmap.mmap (file.fileno(), 0, access = mmap.ACCESS_READ) as content:
+          find_pcb_info (content, info)
       
   except FileNotFoundError:
     print (f"Error: The file '{pcb_file_path}' does not exist.")
@@ -1750,6 +1754,50 @@ def extract_info_from_pcb (pcb_file_path):
 
 #=============================================================================================#
 
+@dataclass (frozen = True)
+class ExportContext:
+  """
+  The information about an input file that all of the generators need.
+
+  Attributes:
+    project_name (str): The project name, without the file extension. Whitespace is replaced with hyphens.
+    info (dict): The information from the title block, like the revision.
+    file_path (str): The absolute path of the input file.
+    project_dir (str): The directory of the input file. The output directories are relative to this.
+  """
+  project_name: str
+  info: dict
+  file_path: str
+  project_dir: str
+
+#=============================================================================================#
+
+def prepare_export_context (input_filename):
+  """
+  Collects the information about an input file that every generator needs.
+  The title block information is cached by extract_info_from_pcb(), so the file is
+  only read again if it has been modified.
+
+  Args:
+    input_filename (str): The path to the PCB or schematic file.
+
+  Returns:
+    ExportContext: The project name, title block information and directories of the input file.
+  """
+  file_name = extract_pcb_file_name (input_filename) # Extract information from the input file
+  file_name = file_name.replace (" ", "-") # If there are whitespace characters in the project name, replace them with a hyphen
+
+  file_path = os.path.abspath (input_filename) # Get the absolute path of the file.
+
+  return ExportContext (
+    project_name = extract_project_name (file_name),
+    info = extract_info_from_pcb (input_filename),
+    file_path = file_path,
+    project_dir = os.path.dirname (file_path)
+  )
+
+#=============================================================================================#
+
 def load_config (config_file = None):
   """
   Loads the JSON configuration file. If no file is provided, it uses the default configuration.
@@ -1786,14 +1834,129 @@ def load_config (config_file = None):
 
 #=============================================================================================#
 
+def get_config_value (key_path):
+  """
+  Reads a value from the current configuration by following the keys in the path.
+  If the value is missing, it is read from the default configuration instead.
+
+  Args:
+    key_path (tuple of str): The keys to the value. For example, ("data", "gerbers", "--output_dir").
+
+  Returns:
+    The value from the current configuration, or the default value if it is not found.
+  """
+  value = current_config
+
+  for key in key_path:
+    if not isinstance (value, dict) or key not in value:
+      # Not found in the current configuration. Use the default value.
+      value = default_config
+      for default_key in key_path:
+        value = value [default_key]
+      return value
+
+    value = value [key]
+
+  return value
+
+#=============================================================================================#
+
+# The handlers for the commands.
+# Each command has the key path of its output directory in the configuration, the generator
+# function, the type of the input file ("pcb" or "sch"), any extra arguments for the generator,
+# and the name of the directory the generator creates inside the output directory.
+COMMAND_HANDLERS = {
+  "gerbers": (("data", "gerbers", "--output_dir"), generateGerbers, "pcb", (), "Gerber"),
+  "drills": (("data", "drills", "--output_dir"), generateDrills, "pcb", (), "Gerber"),
+  "sch_pdf": (("data", "sch_pdf", "--output_dir"), generateSchPdf, "sch", (), "SCH"),
+  "bom": (("data", "bom", "CSV", "--output_dir"), generateBom, "sch", ("CSV",), "BoM"),
+  "ibom": (("data", "bom", "iBoM", "--output_dir"), generateiBoM, "pcb", (), "BoM"),
+  "pcb_pdf": (("data", "pcb_pdf", "--output_dir"), generatePcbPdf, "pcb", (), "PCB"),
+  "positions": (("data", "positions", "--output_dir"), generatePositions, "pcb", (), "Assembly"),
+  "ddd": (("data", "ddd", "STEP", "--output_dir"), generate3D, "pcb", ("STEP",), "3D"),
+  "svg": (("data", "svg", "--output_dir"), generateSvg, "pcb", (), "SVG"),
+}
+
+# The handlers for the commands with modifiers, in the same format as COMMAND_HANDLERS.
+# The commands with any other modifier use their handler from COMMAND_HANDLERS.
+# The modifiers that are not supported yet have no handler (None).
+MODIFIER_HANDLERS = {
+  ("bom", "XLS"): None,
+  ("ddd", "VRML"): (("data", "ddd", "VRML", "--output_dir"), generate3D, "pcb", ("VRML",), "3D"),
+}
+
+#=============================================================================================#
+
+def get_max_jobs (func_name):
+  """
+  Reads the maximum number of jobs to run at the same time from 'kie_max_jobs' in the configuration.
+  It limits both the commands of the run command and the layers of the PCB PDF export.
+
+  Args:
+    func_name (str): The name of the calling function, for the log messages.
+
+  Returns:
+    int: The maximum number of jobs. 0 or an invalid value in the configuration gives the number of CPUs.
+  """
+  max_jobs = get_config_value (("kie_max_jobs",))
+
+  if isinstance (max_jobs, bool) or not isinstance (max_jobs, int) or max_jobs < 0:
+    print (color.yellow (f"{func_name} [WARNING]: Invalid maximum number of jobs '{max_jobs}'. Using the number of CPUs."))
+    max_jobs = 0
+
+  if max_jobs == 0:
+    max_jobs = os.cpu_count() or 1
+
+  return max_jobs
+
+#=============================================================================================#
+
+def run_export_tasks (tasks, input_files, contexts):
+  """
+  Runs the export commands in parallel. Each command runs its own KiCad-CLI process, so
+  threads are enough here. The commands that write to the same directory delete, rename
+  and zip the files in there, so they are run one after the other in the same thread.
+
+  Args:
+    tasks (list of tuple): The output directory and the handler of each command, in order.
+    input_files (dict): The input file for each type of command.
+    contexts (dict): The information about each input file that exists, from prepare_export_context().
+
+  Returns:
+    None
+  """
+  # Group the commands by the name of the final directory they write to, keeping their order.
+  # The output directory is not part of the key, because a command can also write to the
+  # output directory of another command. For example, the gerbers command also exports the
+  # drill files to the drills output directory if kie_include_drill is enabled.
+  task_groups = {}
+
+  for output_dir, handler in tasks:
+    task_groups.setdefault (handler [4], []).append ((output_dir, handler))
+
+  if not task_groups:
+    return
+
+  max_jobs = get_max_jobs ("run")
+
+  def run_task_group (task_group):
+    for output_dir, (_, generator, input_type, extra_args, _) in task_group:
+      generator (output_dir, input_files [input_type], *extra_args, context = contexts.get (input_type))
+
+  with ThreadPoolExecutor (max_workers = min (len (task_groups), max_jobs)) as executor:
+    futures = [executor.submit (run_task_group, task_group) for task_group in task_groups.values()]
+
+    for future in as_completed (futures):
+      future.result() # Raise any unexpected errors from the generators
+
+#=============================================================================================#
+
 def run (config_file):
   print (f"run [INFO]: Running KiExport with configuration file '{color.magenta (config_file)}'.")
   load_config (config_file)
 
   #---------------------------------------------------------------------------------------------#
 
-  valid_commands = ["gerbers", "drills", "sch_pdf", "bom", "ibom", "pcb_pdf", "positions", "ddd", "svg"]
-
   # Get the argument list from the config file.
   user_cmd_list = current_config.get ("commands", [])
   cmd_strings = []
@@ -1808,12 +1971,12 @@ def run (config_file):
     # Check if the commands are valid
     for cmd in user_cmd_list:
       # If cmd is a string, validate directly
-      if isinstance (cmd, str) and cmd in valid_commands:
+      if isinstance (cmd, str) and cmd in VALID_COMMANDS:
         cmd_strings.append (cmd)
         cmd_count += 1
 
       # If cmd is a list, validate the first item as a command
-      elif isinstance (cmd, list) and cmd [0] in valid_commands:
+      elif isinstance (cmd, list) and cmd [0] in VALID_COMMANDS:
         cmd_lists.append (cmd)
         cmd_count += 1
 
@@ -1834,8 +1997,8 @@ def run (config_file):
   pcb_filename = project_name + ".kicad_pcb"
   sch_filename = project_name + ".kicad_sch"
 
-  pcb_file_path = project_dir + "\\" + pcb_filename
-  sch_file_path = project_dir + "\\" + sch_filename
+  pcb_file_path = os.path.join (project_dir, pcb_filename)
+  sch_file_path = os.path.join (project_dir, sch_filename)
 
   # Print the file names.
   print (f"run [INFO]: Project Directory: {color.magenta (project_dir)}")
@@ -1856,111 +2019,47 @@ def run (config_file):
 
   #---------------------------------------------------------------------------------------------#
 
+  # The input file for each type of command.
+  input_files = {"pcb": pcb_file_path, "sch": sch_file_path}
+
+  # Prepare the information about each input file only once, instead of in every command.
+  contexts = {input_type: prepare_export_context (input_file)
+              for input_type, input_file in input_files.items() if os.path.isfile (input_file)}
+
+  # Read the output directory of each command only once, instead of for every instance of the command.
+  # Output directories are relative to the project directory.
+  output_dirs = {key: os.path.join (project_dir, get_config_value (handler [0]))
+                 for key, handler in (COMMAND_HANDLERS | MODIFIER_HANDLERS).items() if handler is not None}
+
+  # Collect the commands and run them together at the end.
+  tasks = []
+
   # Process the commands without any arguments or modifiers.
   for cmd in cmd_strings:
-    if cmd == "gerbers":
-      output_dir = current_config.get ("data", {}).get ("gerbers", {}).get ("--output_dir", default_config ["data"]["gerbers"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateGerbers (output_dir, pcb_file_path)
-
-    elif cmd == "drills":
-      output_dir = current_config.get ("data", {}).get ("drills", {}).get ("--output_dir", default_config ["data"]["drills"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateDrills (output_dir, pcb_file_path)
-
-    elif cmd == "sch_pdf":
-      output_dir = current_config.get ("data", {}).get ("sch_pdf", {}).get ("--output_dir", default_config ["data"]["sch_pdf"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateSchPdf (output_dir, sch_file_path)
-
-    elif cmd == "bom":
-      output_dir = current_config.get ("data", {}).get ("bom", {}).get ("CSV", {}).get ("--output_dir", default_config ["data"]["bom"]["CSV"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateBom (output_dir, sch_file_path, "CSV")
-
-    elif cmd == "ibom":
-      output_dir = current_config.get ("data", {}).get ("bom", {}).get ("iBoM", {}).get ("--output_dir", default_config ["data"]["bom"]["iBoM"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateiBoM (output_dir, pcb_file_path)
-
-    elif cmd == "pcb_pdf":
-      output_dir = current_config.get ("data", {}).get ("pcb_pdf", {}).get ("--output_dir", default_config ["data"]["pcb_pdf"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generatePcbPdf (output_dir, pcb_file_path)
-
-    elif cmd == "positions":
-      output_dir = current_config.get ("data", {}).get ("positions", {}).get ("--output_dir", default_config ["data"]["positions"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generatePositions (output_dir, pcb_file_path)
-
-    elif cmd == "ddd":
-      output_dir = current_config.get ("data", {}).get ("ddd", {}).get ("STEP", {}).get ("--output_dir", default_config ["data"]["ddd"]["STEP"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generate3D (output_dir, pcb_file_path, "STEP")
-    
-    elif cmd == "svg":
-      output_dir = current_config.get ("data", {}).get ("svg", {}).get ("--output_dir", default_config ["data"]["svg"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateSvg (output_dir, pcb_file_path)
+    tasks.append ((output_dirs [cmd], COMMAND_HANDLERS [cmd]))
 
   #---------------------------------------------------------------------------------------------#
 
   # Process the commands with arguments or modifiers.
   for cmd in cmd_lists:
-    if cmd [0] == "gerbers":
-      output_dir = current_config.get ("data", {}).get ("gerbers", {}).get ("--output_dir", default_config ["data"]["gerbers"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateGerbers (output_dir, pcb_file_path)
-    
-    elif cmd [0] == "drills":
-      output_dir = current_config.get ("data", {}).get ("drills", {}).get ("--output_dir", default_config ["data"]["drills"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateDrills (output_dir, pcb_file_path)
-
-    elif cmd [0] == "sch_pdf":
-      output_dir = current_config.get ("data", {}).get ("sch_pdf", {}).get ("--output_dir", default_config ["data"]["sch_pdf"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateSchPdf (output_dir, sch_file_path)
-    
-    elif cmd [0] == "bom":
-      if cmd [1] == "XLS":
-        pass
-      else: # Default is CSV
-        output_dir = current_config.get ("data", {}).get ("bom", {}).get ("CSV", {}).get ("--output_dir", default_config ["data"]["bom"]["CSV"]["--output_dir"])
-        output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-        generateBom (output_dir, sch_file_path, "CSV")
-    
-    elif cmd [0] == "ibom":
-      output_dir = current_config.get ("data", {}).get ("bom", {}).get ("iBoM", {}).get ("--output_dir", default_config ["data"]["bom"]["iBoM"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateiBoM (output_dir, pcb_file_path)
-    
-    elif cmd [0] == "pcb_pdf":
-      output_dir = current_config.get ("data", {}).get ("pcb_pdf", {}).get ("--output_dir", default_config ["data"]["pcb_pdf"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generatePcbPdf (output_dir, pcb_file_path)
-    
-    elif cmd [0] == "positions":
-      output_dir = current_config.get ("data", {}).get ("positions", {}).get ("--output_dir", default_config ["data"]["positions"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generatePositions (output_dir, pcb_file_path)
-    
-    elif cmd [0] == "ddd":
-      if cmd [1] == "VRML":
-        output_dir = current_config.get ("data", {}).get ("ddd", {}).get ("VRML", {}).get ("--output_dir", default_config ["data"]["ddd"]["VRML"]["--output_dir"])
-        output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-        generate3D (output_dir, pcb_file_path, "VRML")
-        
-      else: # Default is STEP
-        output_dir = current_config.get ("data", {}).get ("ddd", {}).get ("STEP", {}).get ("--output_dir", default_config ["data"]["ddd"]["STEP"]["--output_dir"])
-        output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-        generate3D (output_dir, pcb_file_path, "STEP")
-    
-    elif cmd [0] == "svg":
-      output_dir = current_config.get ("data", {}).get ("svg", {}).get ("--output_dir", default_config ["data"]["svg"]["--output_dir"])
-      output_dir = project_dir + "\\" + output_dir  # Output directory is relative to the project directory
-      generateSvg (output_dir, pcb_file_path)
-      
+    modifier = cmd [1] if len (cmd) > 1 else None
+    handler_key = (cmd [0], modifier)
+
+    if handler_key in MODIFIER_HANDLERS:
+      handler = MODIFIER_HANDLERS [handler_key]
+    else:
+      # Use the default handler of the command if there is no specific handler for the modifier.
+      handler_key = cmd [0]
+      handler = COMMAND_HANDLERS [handler_key]
+
+    if handler is None:
+      continue # Not supported yet
+
+    tasks.append ((output_dirs [handler_key], handler))
+
+  #---------------------------------------------------------------------------------------------#
+
+  run_export_tasks (tasks, input_files, contexts)
   return
 
 #=============================================================================================#
@@ -1972,76 +2071,90 @@ def test():
 
 #=============================================================================================#
 
+# The arguments of the commands that export from a single input file.
+# Each command has its help text, the help texts of the input file and the output directory,
+# and any extra arguments as (flags, options) pairs for add_argument().
+# Example: python .\kiexport.py gerbers -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
+# Example: python .\kiexport.py ddd -t "VRML" -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
+EXPORT_SUBPARSERS = {
+  "gerbers": ("Export Gerber files.", "Path to the .kicad_pcb file.", "Directory to save the Gerber files to.", ()),
+  "drills": ("Export Drill files.", "Path to the .kicad_pcb file.", "Directory to save the Drill files to.", ()),
+  "positions": ("Export Position files.", "Path to the .kicad_pcb file.", "Directory to save the Position files to.", ()),
+  "pcb_pdf": ("Export PCB PDF files.", "Path to the .kicad_pcb file.", "Directory to save the PCB PDF files to.", ()),
+  "sch_pdf": ("Export schematic PDF files.", "Path to the .kicad_sch file.", "Directory to save the Schematic PDF files to.", ()),
+  "ddd": ("Export 3D files.", "Path to the .kicad_pcb file.", "Directory to save the 3D files to.",
+          ((("-t", "--type"), {"required": True, "help": "The type of file to generate. Can be STEP or VRML."}),)),
+  "bom": ("Export BoM files.", "Path to the .kicad_sch file.", "Directory to save the BoM files to.",
+          ((("-t", "--type"), {"help": "The type of file to generate. Default is CSV."}),)),
+  "ibom": ("Export HMTL iBoM files. The Kicad iBOM plugin is required", "Path to the .kicad_pcb file.", "Directory to save the BoM files to.", ()),
+  "svg": ("Export SVG files.", "Path to the .kicad_pcb file.", "Directory to save the SVG files to.", ()),
+}
+
+# The functions that run each of the export subcommands, with the parsed arguments.
+CLI_HANDLERS = {
+  "gerbers": lambda args: generateGerbers (args.output_dir, args.input_filename),
+  "drills": lambda args: generateDrills (args.output_dir, args.input_filename),
+  "positions": lambda args: generatePositions (args.output_dir, args.input_filename),
+  "pcb_pdf": lambda args: generatePcbPdf (args.output_dir, args.input_filename),
+  "sch_pdf": lambda args: generateSchPdf (args.output_dir, args.input_filename),
+  "bom": lambda args: generateBom (args.output_dir, args.input_filename, args.type),
+  "ddd": lambda args: generate3D (args.output_dir, args.input_filename, args.type),
+  "ibom": lambda args: generateiBoM (args.output_dir, args.input_filename),
+  "svg": lambda args: generateSvg (args.output_dir, args.input_filename),
+}
+
+# All of the subcommands, in the order they are listed in the help.
+SUBPARSER_COMMANDS = ("run", *EXPORT_SUBPARSERS, "test")
+
+#=============================================================================================#
+
+def add_subparser (subparsers, command):
+  """
+  Adds the subparser of a command and its arguments to the argument parser.
+
+  Args:
+    subparsers (argparse._SubParsersAction): The subparsers of the main argument parser.
+    command (str): The name of the command, from SUBPARSER_COMMANDS.
+  """
+  # Subparser for the Run command.
+  # Example: python .\kiexport.py run -if "Mitayi-Pico-D1/kiexport.json"
+  if command == "run":
+    run_parser = subparsers.add_parser ("run", help = "Run KiExport using the provided JSON configuration file.")
+    run_parser.add_argument ("config_file", help = "Path to the JSON configuration file.")
+    run_parser.add_argument ("command_list", nargs = "?", help = "Specific commands in the JSON to execute (optional).")
+
+  # Subparser for the test function.
+  elif command == "test":
+    subparsers.add_parser ("test", help = "Internal test function.")
+
+  # Subparsers for the export commands.
+  else:
+    help_text, input_help, output_help, extra_args = EXPORT_SUBPARSERS [command]
+    command_parser = subparsers.add_parser (command, help = help_text)
+    command_parser.add_argument ("-if", "--input_filename", required = True, help = input_help)
+    command_parser.add_argument ("-od", "--output_dir", required = True, help = output_help)
+
+    for flags, options in extra_args:
+      command_parser.add_argument (*flags, **options)
+
+#=============================================================================================#
+
 def parseArguments():
+  # The argument parser is only imported when it is needed, after the fast paths in main().
+  import argparse
+
   # Configure the argument parser.
   parser = argparse.ArgumentParser (description = "KiExport: Tool to export manufacturing files from KiCad PCB projects.")
   parser.add_argument ('-v', '--version', action = 'version', version = f'{APP_VERSION}', help = "Show the version of the tool and exit.")
   subparsers = parser.add_subparsers (dest = "command", help = "Available commands.")
 
-  # Subparser for the Run command.
-  # Example: python .\kiexport.py run -if "Mitayi-Pico-D1/kiexport.json"
-  run_parser = subparsers.add_parser ("run", help = "Run KiExport using the provided JSON configuration file.")
-  run_parser.add_argument ("config_file", help = "Path to the JSON configuration file.")
-  run_parser.add_argument ("command_list", nargs = "?", help = "Specific commands in the JSON to execute (optional).")
-
-  # Subparser for the Gerber export command.
-  # Example: python .\kiexport.py gerbers -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  gerbers_parser = subparsers.add_parser ("gerbers", help = "Export Gerber files.")
-  gerbers_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  gerbers_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the Gerber files to.")
-
-  # Subparser for the Drills export command.
-  # Example: python .\kiexport.py drills -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  drills_parser = subparsers.add_parser ("drills", help = "Export Drill files.")
-  drills_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  drills_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the Drill files to.")
-
-  # Subparser for the Position file export command.
-  # Example: python .\kiexport.py positions -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  positions_parser = subparsers.add_parser ("positions", help = "Export Position files.")
-  positions_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  positions_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the Position files to.")
-
-  # Subparser for the PCB PDF export command.
-  # Example: python .\kiexport.py pcb_pdf -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  pcb_pdf_parser = subparsers.add_parser ("pcb_pdf", help = "Export PCB PDF files.")
-  pcb_pdf_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  pcb_pdf_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the PCB PDF files to.")
-
-  # Subparser for the Schematic PDF export command.
-  # Example: python .\kiexport.py sch_pdf -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_sch"
-  sch_pdf_parser = subparsers.add_parser ("sch_pdf", help = "Export schematic PDF files.")
-  sch_pdf_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_sch file.")
-  sch_pdf_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the Schematic PDF files to.")
-
-  # Subparser for the 3D file export command.
-  # Example: python .\kiexport.py ddd -t "VRML" -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  ddd_parser = subparsers.add_parser ("ddd", help = "Export 3D files.")
-  ddd_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  ddd_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the 3D files to.")
-  ddd_parser.add_argument ("-t", "--type", required = True, help = "The type of file to generate. Can be STEP or VRML.")
-
-  # Subparser for the BoM file export command.
-  # Example: python .\kiexport.py bom -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_sch"
-  bom_parser = subparsers.add_parser ("bom", help = "Export BoM files.")
-  bom_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_sch file.")
-  bom_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the BoM files to.")
-  bom_parser.add_argument ("-t", "--type", help = "The type of file to generate. Default is CSV.")
-
-  # Subparser for the HTML iBoM file export command.
-  # Example: python .\kiexport.py ibom -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  ibom_parser = subparsers.add_parser ("ibom", help = "Export HMTL iBoM files. The Kicad iBOM plugin is required")
-  ibom_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  ibom_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the BoM files to.")
-
-  # Subparser for the SVG export command.
-  # Example: python .\kiexport.py svg -od "Mitayi-Pico-D1/Export" -if "Mitayi-Pico-D1/Mitayi-Pico-RP2040.kicad_pcb"
-  svg_parser = subparsers.add_parser ("svg", help = "Export SVG files.")
-  svg_parser.add_argument ("-if", "--input_filename", required = True, help = "Path to the .kicad_pcb file.")
-  svg_parser.add_argument ("-od", "--output_dir", required = True, help = "Directory to save the SVG files to.")
+  # Only build the subparser of the selected command, since only that one is used.
+  # All of them are built if the command is not known, so that the help can list all of the commands.
+  selected_command = sys.argv [1] if len (sys.argv) > 1 else None
+  commands_to_add = [selected_command] if selected_command in SUBPARSER_COMMANDS else SUBPARSER_COMMANDS
 
-  # Subparser for the test function.
-  test_parser = subparsers.add_parser ("test", help = "Internal test function.")
+  for command in commands_to_add:
+    add_subparser (subparsers, command)
 
   #---------------------------------------------------------------------------------------------#
 
@@ -2072,6 +2185,11 @@ def parseArguments():
   if args.command == "run":
     run (args.config_file)
     return
+
+  # The test command does not use any configuration, so run it without loading one.
+  elif args.command == "test":
+    test()
+    return
     
   else:
     # Load the standard config file for other commands.
@@ -2084,37 +2202,10 @@ def parseArguments():
   #---------------------------------------------------------------------------------------------#
   
   # Check the command and run it.
-  
-  if args.command == "gerbers":
-    generateGerbers (args.output_dir, args.input_filename)
+  cli_handler = CLI_HANDLERS.get (args.command)
 
-  elif args.command == "drills":
-    generateDrills (args.output_dir, args.input_filename)
-  
-  elif args.command == "positions":
-    generatePositions (args.output_dir, args.input_filename)
-  
-  elif args.command == "pcb_pdf":
-    generatePcbPdf (args.output_dir, args.input_filename)
-
-  elif args.command == "sch_pdf":
-    generateSchPdf (args.output_dir, args.input_filename)
-
-  elif args.command == "bom":
-    generateBom (args.output_dir, args.input_filename, args.type)
-  
-  elif args.command == "ddd":
-    generate3D (args.output_dir, args.input_filename, args.type)
-
-  elif args.command == "ibom":
-    generateiBoM (args.output_dir, args.input_filename)
-
-  elif args.command == "svg":
-    generateSvg (args.output_dir, args.input_filename)
-
-  elif args.command == "test":
-    test()
-    
+  if cli_handler is not None:
+    cli_handler (args)
   else:
     parser.print_help()
 
@@ -2131,6 +2222,12 @@ def printInfo():
 #=============================================================================================#
 
 def main():
+  # Print the version without building the argument parser.
+  # This is the same output as the '--version' action of the parser.
+  if len (sys.argv) == 2 and sys.argv [1] in ("-v", "--version"):
+    print (APP_VERSION)
+    return
+
   parseArguments()
 
 #=============================================================================================#